@@ -0,0 +1,107 @@
+"""
+识别请求数基准测试
+
+在相同的单次请求时长上限下，比较按固定时长切块与按停顿规划 (plan_speech_segments)
+所需的识别请求数，结果换算为每小时请求数。
+
+用法:
+    python benchmark_segments.py                       # 使用内置的合成语料
+    python benchmark_segments.py a.wav b.wav           # 使用自己的音频
+    python benchmark_segments.py --limits 10 30 60     # 指定请求时长上限(秒)
+"""
+import argparse
+import math
+import sys
+
+import numpy as np
+from pydub import AudioSegment
+
+from main import VideoProcessor
+
+SAMPLE_RATE = 16000
+
+
+def synth_speech(rng, seconds):
+    """
+    合成一段类似语音的信号：噪声按约4Hz的音节节奏调制，中间没有明显停顿
+    """
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    envelope = np.maximum(np.abs(np.sin(np.pi * 4 * t)) ** 0.3, 0.3)
+    return rng.normal(0, 3000, n) * envelope
+
+
+def synth_pause(rng, seconds):
+    """
+    合成一段带底噪的停顿
+    """
+    return rng.normal(0, 60, int(seconds * SAMPLE_RATE))
+
+
+def synth_clip(rng, kind, seconds=600):
+    """
+    合成一段语料
+
+    conversation: 0.4~4秒的短句，句间停顿 0.15~3 秒
+    narration:    2~15秒的长句，句间停顿都短于判定停顿所需的时长，几乎是连续语音
+    """
+    parts = []
+    total = 0
+    while total < seconds:
+        if kind == 'conversation':
+            speech = rng.uniform(0.4, 4.0)
+            pause = rng.uniform(0.15, 0.3) if rng.random() < 0.5 else rng.uniform(0.5, 3.0)
+        else:
+            speech = rng.uniform(2.0, 15.0)
+            pause = rng.uniform(0.1, 0.25)
+        parts.append(synth_speech(rng, speech))
+        parts.append(synth_pause(rng, pause))
+        total += speech + pause
+    samples = np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16)
+    return AudioSegment(data=samples.tobytes(), sample_width=2, frame_rate=SAMPLE_RATE, channels=1)
+
+
+def build_corpus(seed=0):
+    """
+    内置合成语料：6段对话、3段旁白，每段10分钟
+    """
+    rng = np.random.default_rng(seed)
+    corpus = [('conversation', synth_clip(rng, 'conversation')) for _ in range(6)]
+    corpus += [('narration', synth_clip(rng, 'narration')) for _ in range(3)]
+    return corpus
+
+
+def run(corpus, limits_s):
+    processor = VideoProcessor()
+    groups = sorted(set(kind for kind, _ in corpus)) + ['all']
+
+    print(f"{'语料':<14}{'上限':>6}{'时长(小时)':>12}{'固定切块(次/小时)':>20}{'停顿规划(次/小时)':>20}{'减少':>8}")
+    for limit_s in limits_s:
+        limit_ms = int(limit_s * 1000)
+        for group in groups:
+            clips = [audio for kind, audio in corpus if group in ('all', kind)]
+            hours = sum(len(audio) for audio in clips) / 3600000
+            fixed = sum(math.ceil(len(audio) / limit_ms) for audio in clips)
+            # 只比较时长上限，数据量上限放开，保证两种方式使用相同的请求长度
+            planned = sum(len(processor.plan_speech_segments(audio, max_duration_ms=limit_ms,
+                                                             max_payload_bytes=sys.maxsize))
+                          for audio in clips)
+            print(f"{group:<14}{limit_s:>5g}s{hours:>12.2f}{fixed / hours:>20.0f}{planned / hours:>20.0f}"
+                  f"{1 - planned / fixed:>8.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较固定切块与按停顿规划的识别请求数")
+    parser.add_argument('wav', nargs='*', help="要测试的WAV文件，不指定时使用内置合成语料")
+    parser.add_argument('--limits', nargs='+', type=float, default=[10, 30], help="单次请求时长上限(秒)")
+    args = parser.parse_args()
+
+    if args.wav:
+        corpus = [('files', AudioSegment.from_wav(path)) for path in args.wav]
+    else:
+        corpus = build_corpus()
+    run(corpus, args.limits)
+
+
+if __name__ == "__main__":
+    main()
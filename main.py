@@ -17,7 +17,15 @@ class VideoProcessor:
     def __init__(self):
         self.filler_words = ['嗯', '啊', '呃', '额', '那个', '这个', '就是', '然后', '所以', '其实', '你知道', '我觉得']
         self.recognizer = sr.Recognizer()
-        
+        # 识别服务单次请求的限制：最长时长(毫秒)与最大音频数据量(字节)
+        self.max_request_ms = 30000
+        self.max_request_bytes = 1024 * 1024
+        # 封装字幕轨时各容器可用的字幕编码，MP4/MOV 只支持 mov_text，WebM 只支持 WebVTT
+        self.soft_subtitle_codecs = {
+            '.mp4': 'mov_text', '.m4v': 'mov_text', '.mov': 'mov_text',
+            '.mkv': 'srt', '.webm': 'webvtt',
+        }
+
     def extract_audio(self, video_path, output_audio_path):
         """
         从视频中提取音频
@@ -32,21 +40,233 @@ class VideoProcessor:
             print(f"提取音频时出错: {e.stderr.decode()}")
             return False
     
-    def split_audio(self, audio_path, chunk_length_ms=10000):
+    def rms_envelope(self, samples, frame_len):
         """
-        将音频分割成小块以便处理
+        计算每帧 (frame_len 个采样) 的RMS，最后不足一帧的部分按补零后的整帧计算
+        """
+        n_full = len(samples) // frame_len
+        tail = samples[n_full * frame_len:]
+        rms = np.empty(n_full + (1 if len(tail) else 0), dtype=np.float32)
+
+        # 直接在原始整数采样上按帧reshape，分块转为float32求均方，避免整段音频的浮点副本
+        frames = samples[:n_full * frame_len].reshape(n_full, frame_len)
+        block = 4096
+        for i in range(0, n_full, block):
+            chunk = frames[i:i + block].astype(np.float32)
+            rms[i:i + len(chunk)] = np.mean(chunk * chunk, axis=1)
+        if len(tail):
+            tail = tail.astype(np.float32)
+            rms[-1] = np.sum(tail * tail) / frame_len
+        return np.sqrt(rms, out=rms)
+
+    def frame_to_ms(self, index, frame_len, frame_rate):
+        """
+        帧序号转换为毫秒，按实际帧长换算，避免帧长取整带来的累计误差
+        """
+        return index * frame_len * 1000 // frame_rate
+
+    def ms_to_frame(self, milliseconds, frame_len, frame_rate):
+        """
+        毫秒转换为所在的帧序号
+        """
+        return milliseconds * frame_rate // (1000 * frame_len)
+
+    def find_speech_spans(self, rms, threshold, frame_len, frame_rate, total_ms,
+                          min_silence_ms=300, keep_silence_ms=100):
+        """
+        根据RMS包络找出停顿，返回语音片段列表 [(开始毫秒, 结束毫秒), ...]
+
+        RMS低于 threshold 且持续时间不少于 min_silence_ms 的部分视为停顿，
+        片段两端各保留 keep_silence_ms。
+        """
+        silent = rms < threshold
+
+        # 找出连续静音段的起止帧
+        edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1)
+        min_frames = max(1, -(-min_silence_ms * frame_rate // (1000 * frame_len)))
+        long_runs = (run_ends - run_starts) >= min_frames
+        run_starts, run_ends = run_starts[long_runs], run_ends[long_runs]
+
+        # 停顿之间即为语音片段
+        speech_starts = np.concatenate(([0], run_ends))
+        speech_ends = np.concatenate((run_starts, [len(rms)]))
+        spans = []
+        for start, end in zip(speech_starts, speech_ends):
+            if end <= start:
+                continue
+            start_ms = max(0, self.frame_to_ms(int(start), frame_len, frame_rate) - keep_silence_ms)
+            end_ms = min(total_ms, self.frame_to_ms(int(end), frame_len, frame_rate) + keep_silence_ms)
+            if spans and start_ms < spans[-1][1]:
+                start_ms = spans[-1][1]
+            if end_ms > start_ms:
+                spans.append((start_ms, end_ms))
+        return spans
+
+    def split_long_span(self, span, rms, threshold, frame_len, frame_rate, limit_ms, cut_window=0.15):
+        """
+        将超过请求上限的语音片段切开，切分点尽量靠近上限以减少请求数，同时避免切断词语
+
+        在上限前最后 cut_window 比例的范围内取最靠后的静音帧；没有静音帧时取最靠后的
+        低能量帧 (不高于该范围内RMS的25%分位)，即最后一个音节间隙。
+        """
+        start_ms, end_ms = span
+        pieces = []
+        while end_ms - start_ms > limit_ms:
+            latest_ms = start_ms + limit_ms
+            lo = self.ms_to_frame(latest_ms - int(limit_ms * cut_window), frame_len, frame_rate)
+            hi = self.ms_to_frame(latest_ms, frame_len, frame_rate)
+            window = rms[lo:hi + 1]
+            quiet = np.flatnonzero(window < threshold)
+            if len(quiet):
+                cut_ms = self.frame_to_ms(lo + int(quiet[-1]), frame_len, frame_rate)
+            elif len(window):
+                valleys = np.flatnonzero(window <= np.percentile(window, 25))
+                cut_ms = self.frame_to_ms(lo + int(valleys[-1]), frame_len, frame_rate)
+            else:
+                cut_ms = latest_ms
+            if not start_ms < cut_ms <= latest_ms:
+                cut_ms = latest_ms
+            pieces.append((start_ms, cut_ms))
+            start_ms = cut_ms
+        pieces.append((start_ms, end_ms))
+        return pieces
+
+    def pack_speech_spans(self, spans, limit_ms, gap_ms=0):
+        """
+        按时间顺序将语音片段装入尽量少的识别请求
+
+        每个请求包含 'spans': [(请求内偏移毫秒, 原音频开始毫秒, 时长毫秒), ...]
+        和 'duration_ms'，片段之间可插入 gap_ms 的静音。片段两端已保留了停顿中的静音，
+        默认不再额外插入，以免占用请求时长。
+        片段之间只插入固定间隔，所以按顺序贪心装箱即可得到最少的请求数。
+        """
+        segments = []
+        current = None
+        for start_ms, end_ms in spans:
+            duration = end_ms - start_ms
+            if current is not None and current['duration_ms'] + gap_ms + duration <= limit_ms:
+                offset = current['duration_ms'] + gap_ms
+            else:
+                current = {'spans': [], 'duration_ms': 0}
+                segments.append(current)
+                offset = 0
+            current['spans'].append((offset, start_ms, duration))
+            current['duration_ms'] = offset + duration
+        return segments
+
+    def plan_speech_segments(self, audio, max_duration_ms=None, max_payload_bytes=None,
+                             gap_ms=0, frame_ms=30, silence_offset_db=-16):
+        """
+        根据停顿规划识别请求，在服务限制内用尽量少的请求覆盖所有语音
+
+        audio 为已加载的 AudioSegment，与 export_speech_segments 共用。
+        静音阈值为整段音频的平均电平加上 silence_offset_db。
+        """
+        if max_duration_ms is None:
+            max_duration_ms = self.max_request_ms
+        if max_payload_bytes is None:
+            max_payload_bytes = self.max_request_bytes
+
+        frame_rate = audio.frame_rate
+        frame_len = max(1, frame_rate * frame_ms // 1000)
+
+        # WAV 文件头 44 字节，其余按PCM数据量换算为可用时长
+        bytes_per_ms = frame_rate * audio.sample_width * audio.channels / 1000
+        limit_ms = int(min(max_duration_ms, (max_payload_bytes - 44) / bytes_per_ms))
+        if limit_ms < self.frame_to_ms(1, frame_len, frame_rate):
+            raise ValueError(f"单次请求上限 {limit_ms} 毫秒小于分析帧长 {frame_ms} 毫秒")
+
+        # 直接读取原始PCM数据，不复制整段音频
+        mono = audio.set_channels(1) if audio.channels > 1 else audio
+        samples = np.frombuffer(mono.raw_data, dtype=mono.array_type)
+        if len(samples) == 0:
+            return []
+
+        rms = self.rms_envelope(samples, frame_len)
+        mean_rms = np.sqrt(np.mean(np.square(rms, dtype=np.float64)))
+        if mean_rms == 0:
+            return []
+        threshold = mean_rms * 10 ** (silence_offset_db / 20)
+
+        total_ms = len(samples) * 1000 // frame_rate
+        spans = self.find_speech_spans(rms, threshold, frame_len, frame_rate, total_ms)
+        pieces = []
+        for span in spans:
+            pieces.extend(self.split_long_span(span, rms, threshold, frame_len, frame_rate, limit_ms))
+        return self.pack_speech_spans(pieces, limit_ms, gap_ms)
+
+    def export_speech_segments(self, audio_path, audio, segments):
+        """
+        按规划结果导出每个识别请求的音频文件，只包含语音片段和片段间的短静音
         """
-        audio = AudioSegment.from_wav(audio_path)
         chunks = []
-        
-        for i in range(0, len(audio), chunk_length_ms):
-            chunk = audio[i:i + chunk_length_ms]
-            chunk_path = f"{audio_path.replace('.wav', '')}_chunk_{i//chunk_length_ms}.wav"
+
+        for i, segment in enumerate(segments):
+            chunk = audio[:0]
+            for offset, source_start, duration in segment['spans']:
+                if offset > len(chunk):
+                    chunk += AudioSegment.silent(duration=offset - len(chunk), frame_rate=audio.frame_rate)
+                chunk += audio[source_start:source_start + duration]
+            chunk_path = f"{audio_path.replace('.wav', '')}_segment_{i}.wav"
             chunk.export(chunk_path, format="wav")
             chunks.append(chunk_path)
-            
+
         return chunks
-    
+
+    def map_segment_time(self, segment, offset_ms):
+        """
+        将请求音频内的时间映射回原音频时间，落在插入的静音中时取下一个片段的开始
+        """
+        for offset, source_start, duration in segment['spans']:
+            if offset_ms < offset:
+                return source_start
+            if offset_ms <= offset + duration:
+                return source_start + offset_ms - offset
+        offset, source_start, duration = segment['spans'][-1]
+        return source_start + duration
+
+    def segment_cues(self, segments, transcriptions, max_cue_ms=10000):
+        """
+        将每个请求的识别文本拆分为字幕条目，返回 (文本列表, 起止时间列表)
+
+        识别服务只返回整段文本，因此每个语音片段(超过 max_cue_ms 时再等分)单独成为一条字幕，
+        分词后按各片段时长占比分配文本，时间通过偏移表映射回原音频。
+        """
+        texts = []
+        timings = []
+        for segment, text in zip(segments, transcriptions):
+            words = jieba.lcut(text.strip())
+            if not words:
+                continue
+
+            # 请求内的字幕时间段 [(开始偏移, 结束偏移), ...]
+            pieces = []
+            for offset, source_start, duration in segment['spans']:
+                count = max(1, -(-duration // max_cue_ms))
+                for k in range(count):
+                    pieces.append((offset + duration * k // count, offset + duration * (k + 1) // count))
+
+            # 按字数位置把每个词分配到对应语音时长所在的时间段
+            speech_ms = sum(end - start for start, end in pieces)
+            total_chars = sum(len(word) for word in words)
+            bounds = np.cumsum([end - start for start, end in pieces]) / max(speech_ms, 1)
+            piece_words = [[] for _ in pieces]
+            position = 0
+            for word in words:
+                center = (position + len(word) / 2) / total_chars
+                index = min(int(np.searchsorted(bounds, center)), len(pieces) - 1)
+                piece_words[index].append(word)
+                position += len(word)
+
+            for (start, end), cue_words in zip(pieces, piece_words):
+                cue_text = ''.join(cue_words).strip()
+                if cue_text:
+                    texts.append(cue_text)
+                    timings.append((self.map_segment_time(segment, start), self.map_segment_time(segment, end)))
+        return texts, timings
+
     def recognize_speech(self, audio_path):
         """
         使用语音识别将音频转换为文本
@@ -92,32 +312,40 @@ class VideoProcessor:
         minutes, seconds = divmod(seconds, 60)
         hours, minutes = divmod(minutes, 60)
         return f"{hours}:{minutes:02d}:{seconds:02d}.{centiseconds:02d}"
+
+    def chunk_timings(self, chunks_transcriptions, timings=None):
+        """
+        返回每段识别结果的起止时间(毫秒)，未提供时按每块10秒计算
+        """
+        if timings is not None:
+            return timings
+        return [(i * 10000, (i + 1) * 10000) for i in range(len(chunks_transcriptions))]
         
-    def export_subtitle_srt(self, chunks_transcriptions, output_path):
+    def export_subtitle_srt(self, chunks_transcriptions, output_path, timings=None):
         """
         导出SRT格式字幕文件 (适用于PR、Vegas等)
         """
+        timings = self.chunk_timings(chunks_transcriptions, timings)
         with open(output_path, 'w', encoding='utf-8') as f:
             subtitle_index = 1
-            current_time = 0
             
-            for i, text in enumerate(chunks_transcriptions):
+            for text, (start_ms, end_ms) in zip(chunks_transcriptions, timings):
                 if text.strip():
-                    start_time = self.format_time(current_time)
-                    end_time = self.format_time(current_time + 10000)  # 假设每个块10秒
+                    start_time = self.format_time(start_ms)
+                    end_time = self.format_time(end_ms)
                     
                     f.write(f"{subtitle_index}\n")
                     f.write(f"{start_time} --> {end_time}\n")
                     f.write(f"{text}\n\n")
                     
                     subtitle_index += 1
-                current_time += 10000
         return True
     
-    def export_subtitle_ass(self, chunks_transcriptions, output_path):
+    def export_subtitle_ass(self, chunks_transcriptions, output_path, timings=None):
         """
         导出ASS格式字幕文件 (适用于剪映等)
         """
+        timings = self.chunk_timings(chunks_transcriptions, timings)
         with open(output_path, 'w', encoding='utf-8') as f:
             # 写入ASS文件头
             f.write("[Script Info]\n")
@@ -136,64 +364,210 @@ class VideoProcessor:
             f.write("[Events]\n")
             f.write("Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n")
             
-            current_time = 0
-            for i, text in enumerate(chunks_transcriptions):
+            for text, (start_ms, end_ms) in zip(chunks_transcriptions, timings):
                 if text.strip():
-                    start_time = self.format_time_ass(current_time)
-                    end_time = self.format_time_ass(current_time + 10000)  # 假设每个块10秒
+                    start_time = self.format_time_ass(start_ms)
+                    end_time = self.format_time_ass(end_ms)
                     
                     f.write(f"Dialogue: 0,{start_time},{end_time},Default,,0,0,0,,{text}\n")
-                
-                current_time += 10000
         return True
     
-    def export_subtitle_txt(self, chunks_transcriptions, output_path):
+    def export_subtitle_txt(self, chunks_transcriptions, output_path, timings=None):
         """
         导出TXT格式字幕文件 (适用于必剪等)
         """
+        timings = self.chunk_timings(chunks_transcriptions, timings)
         with open(output_path, 'w', encoding='utf-8') as f:
-            current_time = 0
-            for i, text in enumerate(chunks_transcriptions):
+            for text, (start_ms, end_ms) in zip(chunks_transcriptions, timings):
                 if text.strip():
-                    start_seconds = current_time / 1000
-                    end_seconds = (current_time + 10000) / 1000  # 假设每个块10秒
+                    start_seconds = start_ms / 1000
+                    end_seconds = end_ms / 1000
                     
                     # 格式: [开始时间(秒)] [结束时间(秒)] 文本内容
                     f.write(f"{start_seconds:.2f} {end_seconds:.2f} {text}\n")
-                
-                current_time += 10000
         return True
         
-    def generate_subtitles(self, chunks_transcriptions, output_srt_path):
+    def generate_subtitles(self, chunks_transcriptions, output_srt_path, timings=None):
         """
         生成SRT格式的字幕文件
         """
-        return self.export_subtitle_srt(chunks_transcriptions, output_srt_path)
+        return self.export_subtitle_srt(chunks_transcriptions, output_srt_path, timings)
     
+    def normalize_output_targets(self, output_path):
+        """
+        将输出参数统一为输出目标列表
+
+        output_path 可以是单个路径字符串，也可以是由路径字符串或字典组成的列表。
+        字典支持的键:
+            path          输出文件路径 (必填)
+            resolution    输出分辨率，如 (1280, 720)、"1280x720"，宽或高可用 -2 保持比例
+            vcodec        视频编码器，如 'libx264'、'libx265'
+            crf           质量参数
+            acodec        音频编码器，如 'aac'、'copy'
+            subtitle_mode 字幕方式: 'hard' 烧录 (默认)、'soft' 封装字幕轨、'none' 不带字幕
+
+        'soft' 只支持 soft_subtitle_codecs 中列出的容器，其他容器在渲染前直接报错，
+        以免一个目标失败导致整个 ffmpeg 进程中的所有输出都中止。
+        """
+        if isinstance(output_path, (str, dict)):
+            output_path = [output_path]
+
+        targets = []
+        for target in output_path:
+            if isinstance(target, str):
+                target = {'path': target}
+            else:
+                target = dict(target)
+
+            if not target.get('path'):
+                raise ValueError("输出目标缺少 path")
+
+            target.setdefault('subtitle_mode', 'hard')
+            if target['subtitle_mode'] not in ('hard', 'soft', 'none'):
+                raise ValueError(f"不支持的字幕方式: {target['subtitle_mode']}")
+            if target['subtitle_mode'] == 'soft':
+                ext = os.path.splitext(target['path'])[1].lower()
+                if ext not in self.soft_subtitle_codecs:
+                    raise ValueError(f"{ext or '无扩展名'} 容器不支持封装字幕轨: {target['path']}")
+
+            resolution = target.get('resolution')
+            if isinstance(resolution, str):
+                width, height = resolution.lower().split('x')
+                target['resolution'] = (int(width), int(height))
+
+            targets.append(target)
+
+        if not targets:
+            raise ValueError("至少需要一个输出目标")
+        return targets
+
+    def output_kwargs(self, target):
+        """
+        根据输出目标生成编码相关的 ffmpeg 输出参数
+        """
+        kwargs = {}
+        if target.get('vcodec'):
+            kwargs['vcodec'] = target['vcodec']
+        if target.get('crf') is not None:
+            kwargs['crf'] = target['crf']
+        if target.get('acodec'):
+            kwargs['acodec'] = target['acodec']
+        return kwargs
+
+    def split_stream(self, stream, count):
+        """
+        将视频流拆分为 count 路，只有一路时直接返回原视频流
+        """
+        if count == 1:
+            return [stream]
+        # split 的路数由 ffmpeg-python 按下游数量自动填写
+        split = stream.filter_multi_output('split')
+        return [split[i] for i in range(count)]
+
     def embed_subtitles(self, video_path, subtitle_path, output_path):
         """
         将字幕嵌入到视频中
+
+        output_path 为列表时，所有输出目标共用一次解码：烧录字幕的目标只运行一次
+        subtitles 滤镜，再通过 split 滤镜分发给各个分辨率/编码的输出，全部在同一个
+        ffmpeg 进程中完成。
+        """
+        targets = self.normalize_output_targets(output_path)
+        if len(targets) == 1 and targets[0]['subtitle_mode'] == 'hard':
+            return self.embed_subtitles_single(video_path, subtitle_path, targets[0])
+        return self.embed_subtitles_multi(video_path, subtitle_path, targets)
+
+    def embed_subtitles_single(self, video_path, subtitle_path, target):
+        """
+        单个输出目标时直接用 -vf 烧录字幕
         """
         try:
             # 对路径进行处理，确保路径格式正确
             subtitle_path_escaped = subtitle_path.replace('\\', '\\\\').replace(':', '\\:')
             
             # 使用单引号包裹字幕路径，并确保路径格式正确
+            vf = f"subtitles='{subtitle_path_escaped}'"
+            if target.get('resolution'):
+                width, height = target['resolution']
+                vf += f",scale={width}:{height}"
+
             (ffmpeg
              .input(video_path)
-             .output(output_path, vf=f"subtitles='{subtitle_path_escaped}'")
+             .output(target['path'], vf=vf, **self.output_kwargs(target))
              .run(capture_stdout=True, capture_stderr=True, overwrite_output=True))
             return True
         except ffmpeg.Error as e:
             print(f"嵌入字幕时出错: {e.stderr.decode()}")
             return False
-    
+
+    def embed_subtitles_multi(self, video_path, subtitle_path, targets):
+        """
+        单次解码、多路输出地嵌入字幕
+        """
+        try:
+            source = ffmpeg.input(video_path)
+            # 可选音频流，没有音轨的视频也能正常处理
+            audio = source['a?']
+
+            hard_targets = [t for t in targets if t['subtitle_mode'] == 'hard']
+            plain_targets = [t for t in targets if t['subtitle_mode'] != 'hard']
+
+            # 解码后的画面先拆成一路给字幕滤镜，其余直接给不烧录字幕的输出
+            decoded = self.split_stream(source.video, len(plain_targets) + (1 if hard_targets else 0))
+            branches = {}
+            if hard_targets:
+                # 字幕路径必须用关键字参数传入：ffmpeg-python 对关键字参数恰好转义两层，
+                # 与 ffmpeg 解析滤镜图和滤镜选项时去掉的两层对应，盘符和反斜杠都能保留；
+                # 位置参数会被多转义一层，Windows 路径会失效
+                burned = decoded.pop(0).filter('subtitles', filename=subtitle_path)
+                for target, stream in zip(hard_targets, self.split_stream(burned, len(hard_targets))):
+                    branches[id(target)] = stream
+            for target, stream in zip(plain_targets, decoded):
+                branches[id(target)] = stream
+
+            soft_subtitle = None
+            if any(t['subtitle_mode'] == 'soft' for t in targets):
+                soft_subtitle = ffmpeg.input(subtitle_path)['s']
+
+            outputs = []
+            for target in targets:
+                video = branches[id(target)]
+                if target.get('resolution'):
+                    width, height = target['resolution']
+                    video = video.filter('scale', width, height)
+
+                streams = [video, audio]
+                kwargs = self.output_kwargs(target)
+                if target['subtitle_mode'] == 'soft':
+                    streams.append(soft_subtitle)
+                    ext = os.path.splitext(target['path'])[1].lower()
+                    kwargs['scodec'] = self.soft_subtitle_codecs[ext]
+
+                outputs.append(ffmpeg.output(*streams, target['path'], **kwargs))
+
+            (ffmpeg
+             .merge_outputs(*outputs)
+             .run(capture_stdout=True, capture_stderr=True, overwrite_output=True))
+            return True
+        except ffmpeg.Error as e:
+            print(f"嵌入字幕时出错: {e.stderr.decode()}")
+            return False
+
     def process_video(self, video_path, output_path, progress_callback=None):
         """
         处理视频的主函数
+
+        output_path 可以是单个路径，也可以是输出目标列表 (见 normalize_output_targets)，
+        多个目标会在一次解码中同时渲染。
         """
+        if not isinstance(output_path, str):
+            output_path = self.normalize_output_targets(output_path)
+            first_output = output_path[0]['path']
+        else:
+            first_output = output_path
+
         # 创建临时目录 - 确保临时目录与输出视频在同一驱动器上
-        output_dir = os.path.dirname(output_path)
+        output_dir = os.path.dirname(first_output)
         temp_dir = os.path.join(output_dir, "temp")
         os.makedirs(temp_dir, exist_ok=True)
         
@@ -205,11 +579,13 @@ class VideoProcessor:
         if not self.extract_audio(video_path, audio_path):
             return False
         
-        # 分割音频
+        # 按停顿规划识别请求
         if progress_callback:
             progress_callback(20, "正在分割音频...")
         
-        audio_chunks = self.split_audio(audio_path)
+        audio = AudioSegment.from_wav(audio_path)
+        segments = self.plan_speech_segments(audio)
+        audio_chunks = self.export_speech_segments(audio_path, audio, segments)
         
         # 语音识别
         if progress_callback:
@@ -236,7 +612,8 @@ class VideoProcessor:
             progress_callback(70, "正在生成字幕文件...")
         
         subtitle_path = os.path.join(temp_dir, "subtitles.srt")
-        self.generate_subtitles(filtered_transcriptions, subtitle_path)
+        cue_texts, timings = self.segment_cues(segments, filtered_transcriptions)
+        self.generate_subtitles(cue_texts, subtitle_path, timings)
         
         # 嵌入字幕
         if progress_callback:
@@ -445,9 +822,11 @@ class VideoProcessorApp:
             if not self.processor.extract_audio(self.video_path, audio_path):
                 raise Exception("音频提取失败")
             
-            # 分割音频
+            # 按停顿规划识别请求
             self.root.after(0, lambda: self.update_progress(20, "正在分割音频..."))
-            audio_chunks = self.processor.split_audio(audio_path)
+            audio = AudioSegment.from_wav(audio_path)
+            segments = self.processor.plan_speech_segments(audio)
+            audio_chunks = self.processor.export_speech_segments(audio_path, audio, segments)
             
             # 语音识别
             self.root.after(0, lambda: self.update_progress(30, "正在进行语音识别..."))
@@ -463,17 +842,18 @@ class VideoProcessorApp:
             # 过滤填充词
             self.root.after(0, lambda: self.update_progress(60, "正在过滤填充词..."))
             filtered_transcriptions = [self.processor.filter_filler_words(text) for text in transcriptions]
+            cue_texts, timings = self.processor.segment_cues(segments, filtered_transcriptions)
             
             # 导出字幕
             self.root.after(0, lambda: self.update_progress(80, "正在导出字幕文件..."))
             
             success = False
             if subtitle_format == "srt":
-                success = self.processor.export_subtitle_srt(filtered_transcriptions, subtitle_path)
+                success = self.processor.export_subtitle_srt(cue_texts, subtitle_path, timings)
             elif subtitle_format == "ass":
-                success = self.processor.export_subtitle_ass(filtered_transcriptions, subtitle_path)
+                success = self.processor.export_subtitle_ass(cue_texts, subtitle_path, timings)
             elif subtitle_format == "txt":
-                success = self.processor.export_subtitle_txt(filtered_transcriptions, subtitle_path)
+                success = self.processor.export_subtitle_txt(cue_texts, subtitle_path, timings)
             
             # 清理临时文件
             self.root.after(0, lambda: self.update_progress(90, "正在清理临时文件..."))